@@ -0,0 +1,17 @@
+from airline_pii_redactor import AirlinePIIRedactor
+
+if __name__ == "__main__":
+    # Test
+    redactor = AirlinePIIRedactor()
+    test_texts = [
+        "Passenger John Smith contact +1-555-555-5555",
+        "Customer 李明 booked flight MU567",
+        "PNR is X9Y8Z7.",
+        "My ticket number is 176-1234567890.",
+        "Frequent flyer AA12345678 has 5000 miles.",
+        "I was born on 1990-05-20 and want to fly tomorrow."
+    ]
+    for t in test_texts:
+        print(f"Original: {t}")
+        print(f"Redacted: {redactor.redact(t)}")
+        print("-" * 20)
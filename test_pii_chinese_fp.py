@@ -1,10 +1,10 @@
 
 import unittest
-from airline_pii_redactor import AirlinePIIRedactor
+from airline_pii_redactor import get_default_redactor
 
 class TestPIIFalsePositivesAndChinese(unittest.TestCase):
     def setUp(self):
-        self.redactor = AirlinePIIRedactor()
+        self.redactor = get_default_redactor()
 
     def test_english_false_positives(self):
         # Common words that might look like names or codes
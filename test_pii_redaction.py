@@ -1,10 +1,13 @@
 
 import unittest
-from airline_pii_redactor import AirlinePIIRedactor
+from presidio_analyzer import RecognizerResult
+from presidio_anonymizer import AnonymizerEngine
+from presidio_anonymizer.entities import OperatorConfig
+from airline_pii_redactor import AirlinePIIRedactor, get_default_redactor
 
 class TestAirlinePIIRedaction(unittest.TestCase):
     def setUp(self):
-        self.redactor = AirlinePIIRedactor()
+        self.redactor = get_default_redactor()
 
     def test_names_english(self):
         text = "Passenger John Smith and Jane Doe are traveling."
@@ -39,6 +42,19 @@ class TestAirlinePIIRedaction(unittest.TestCase):
             # Ensure digits are gone
             self.assertFalse(any(char.isdigit() for char in redacted.split(tag)[0]))
 
+    def test_phone_overlapping_regions(self):
+        # Numbers from different regions may overlap; each region is reported independently
+        cases = [
+            ("5278 7003 857500", [("HK", "5278 7003"), ("UK", "7003 857500")]),
+            ("0938-224-808\n9431818", [("TW", "0938-224-808"), ("US_CA", "808\n9431818")]),
+            # CN shape with an unassigned prefix still falls through to the other regions
+            ("Call 14012345678", [("US_CA", "14012345678")]),
+            ("Call 13800138000", [("CN", "13800138000")]),
+        ]
+        for original, expected in cases:
+            found = [(p['region'], p['text']) for p in self.redactor.phone_recognizer.analyze(original)]
+            self.assertEqual(found, expected, f"Phone regions differ for: {original!r}")
+
     def test_pnr_basic(self):
         text = "My PNR is X9Y8Z7."
         redacted = self.redactor.redact(text)
@@ -127,5 +143,63 @@ class TestAirlinePIIRedaction(unittest.TestCase):
         redacted = self.redactor.redact(text)
         self.assertIn("[Payment]", redacted)
 
+    def test_redact_batch(self):
+        texts = ["My PNR is X9Y8Z7.", "Contact me at test.user@airline.com.", "May I help you?"]
+        expected = [self.redactor.redact(t) for t in texts]
+        self.assertEqual(self.redactor.redact_batch(texts, workers=2, batch_size=2), expected)
+        self.assertEqual(self.redactor.redact_batch(texts, workers=2, batch_size=2, use_threads=True), expected)
+        self.assertEqual(self.redactor.redact_batch([]), [])
+
+    def test_redact_batch_custom_operators(self):
+        # Worker processes must redact with the calling instance's operators, like the thread pool
+        redactor = AirlinePIIRedactor()
+        redactor.anonymizer_operators["PNR"] = OperatorConfig("replace", {"new_value": "<LOCATOR>"})
+        texts = ["My PNR is X9Y8Z7.", "May I help you?"]
+        expected = [redactor.redact(t) for t in texts]
+        self.assertEqual(expected[0], "My PNR is <LOCATOR>.")
+        self.assertEqual(redactor.redact_batch(texts, workers=2, batch_size=1), expected)
+        self.assertEqual(redactor.redact_batch(texts, workers=2, batch_size=1, use_threads=True), expected)
+
+    def test_redact_many(self):
+        texts = ["Passenger John Smith and Jane Doe are traveling.", "Born on 1990-05-20.", "Flying on 2025-12-25."]
+        self.assertEqual(self.redactor.redact_many(texts), [self.redactor.redact(t) for t in texts])
+
+    def test_fast_anonymize_matches_presidio(self):
+        # _fast_anonymize re-implements AnonymizerEngine's conflict removal, whitespace merge and
+        # replacement order; hand-built result sets keep the two in step without spaCy
+        text = "John Smith  Li Wei called 13800138000 from Hong Kong about PNR X9Y8Z7, flight MU567."
+
+        def span(fragment, entity_type, score, offset=0, length=None):
+            start = text.index(fragment) + offset
+            end = start + (len(fragment) - offset if length is None else length)
+            return RecognizerResult(entity_type, start, end, score)
+
+        cases = [
+            # Partially overlapping types
+            [span("John Smith", "PERSON", 0.85), span("Smith  Li", "PHONE_NUMBER", 0.9)],
+            # Contained result is dropped
+            [span("John Smith", "PERSON", 0.85), span("Smith", "LOCATION", 0.85)],
+            # Equal spans: the lower score loses, and so does the first of equal scores
+            [span("X9Y8Z7", "PNR", 0.4), span("X9Y8Z7", "Flight Number", 0.6)],
+            [span("X9Y8Z7", "PNR", 0.6), span("X9Y8Z7", "Frequent Flyer", 0.6)],
+            # Same-type neighbours separated only by spaces become one entity
+            [span("John Smith", "PERSON", 0.85), span("Li Wei", "PERSON", 0.85), span("13800138000", "PHONE_NUMBER", 0.95)],
+            [span("John", "PERSON", 0.85), span("Smith", "PERSON", 0.85), span("Hong Kong", "EMAIL_ADDRESS", 0.9)],
+            # Keep operators and the <TYPE> default for unmapped types
+            [span("Hong Kong", "LOCATION", 0.85), span("MU567", "URL", 0.5), span("X9Y8Z7", "PNR", 0.4, 2, 2)],
+            [],
+        ]
+        engine = AnonymizerEngine()
+        for results in cases:
+            fast = self.redactor._fast_anonymize(text, list(results), self.redactor.anonymizer_operators)
+            expected = engine.anonymize(
+                text=text, analyzer_results=list(results), operators=dict(self.redactor.anonymizer_operators)
+            ).text
+            self.assertEqual(fast, expected, f"Fast anonymizer differs for: {results}")
+
+        # Unmerged same-type overlaps are left to Presidio
+        overlapping = [span("John Smith", "PERSON", 0.85), span("Smith  Li", "PERSON", 0.85)]
+        self.assertIsNone(self.redactor._fast_anonymize(text, overlapping, self.redactor.anonymizer_operators))
+
 if __name__ == '__main__':
     unittest.main()